@@ -24,7 +24,7 @@
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-import signal, sys, traceback, gc, os, shutil
+import signal, sys, traceback, gc, os, shutil, time
 
 try:
     import PyQt5
@@ -151,6 +151,7 @@ class ElectrumGui(QObject, PrintError):
         # Entries in this map are deleted after 10 seconds by the QTimer (which
         # also deletes itself)
         self._wallet_password_cache = Weak.KeyDictionary()
+        self._cached_cameras = (0.0, None)  # (timestamp, cameras_list) -- see get_cached_cameras()
         # /
         self.update_checker = UpdateChecker()
         self.update_checker_timer = QTimer(self); self.update_checker_timer.timeout.connect(self.on_auto_update_timeout); self.update_checker_timer.setSingleShot(False)
@@ -212,6 +213,20 @@ class ElectrumGui(QObject, PrintError):
             return False
         return True
 
+    def get_cached_cameras(self):
+        ''' Returns the list of QCameraInfo objects for the system's cameras.
+        Enumerating the video devices can block for a noticeable amount of time
+        on some platforms, so the result is cached for 10 seconds.
+
+        Raises ImportError if QtMultimedia is missing. '''
+        from PyQt5.QtMultimedia import QCameraInfo
+        ts, cameras = self._cached_cameras
+        now = time.monotonic()
+        if cameras is None or now - ts >= 10.0:
+            cameras = QCameraInfo.availableCameras()
+            self._cached_cameras = (now, cameras)
+        return cameras
+
     def set_dark_theme_if_needed(self):
         use_dark_theme = self.config.get('qt_gui_color_theme', 'default') == 'dark'
         darkstyle_ver = None
@@ -183,29 +183,60 @@ class HistoryList(MyTreeWidget):
         if not self.wallet: return # can happen on startup if this is called before self.on_update()
         item = self._item_cache.get(tx_hash)
         if item:
-            idx = self.invisibleRootItem().indexOfChild(item)
-            was_cur = False
-            if idx > -1:
-                # We must take the child out of the view when updating.
-                # This is because otherwise for widgets with many thousands of
-                # items, this method becomes *horrendously* slow (500ms per
-                # call!)... but doing this hack makes it fast (~1ms per call).
-                was_cur = self.currentItem() is item
-                self.invisibleRootItem().takeChild(idx)
-            status, status_str = self.wallet.get_tx_status(tx_hash, height, conf, timestamp)
-            icon = self._get_icon_for_status(status)
-            if icon: item.setIcon(0, icon)
-            item.setData(0, SortableTreeWidgetItem.DataRole, (status, conf))
-            item.setText(2, status_str)
-            if idx > -1:
-                # Now, put the item back again
-                self.invisibleRootItem().insertChild(idx, item)
-                if was_cur:
-                    self.setCurrentItem(item)
+            self._update_item_status(item, tx_hash, height, conf, timestamp, self.currentItem())
         elif self.should_defer_update_incr():
             return False
         return bool(item)  # indicate to client code whether an actual update occurred
 
+    def _update_item_status(self, item, tx_hash, height, conf, timestamp, cur):
+        ''' Updates the status icon/text of `item` in place. `cur` is the
+        list's currentItem(), passed in so batch callers query it just once. '''
+        root = self.invisibleRootItem()
+        idx = root.indexOfChild(item)
+        if idx > -1:
+            # We must take the child out of the view when updating.
+            # This is because otherwise for widgets with many thousands of
+            # items, this method becomes *horrendously* slow (500ms per
+            # call!)... but doing this hack makes it fast (~1ms per call).
+            root.takeChild(idx)
+        status, status_str = self.wallet.get_tx_status(tx_hash, height, conf, timestamp)
+        icon = self._get_icon_for_status(status)
+        if icon: item.setIcon(0, icon)
+        item.setData(0, SortableTreeWidgetItem.DataRole, (status, conf))
+        item.setText(2, status_str)
+        if idx > -1:
+            # Now, put the item back again
+            root.insertChild(idx, item)
+            if item is cur:
+                self.setCurrentItem(item)
+
+    def present_items(self, items):
+        ''' Returns the subset of `items` ((tx_hash, ...) tuples) whose tx_hash
+        currently has a row in this list, preserving order. '''
+        cache = self._item_cache
+        return [item for item in items if item[0] in cache]
+
+    def update_items(self, items):
+        ''' Batch version of update_item. `items` is an iterable of
+        (tx_hash, height, conf, timestamp) tuples. If a tx_hash appears more
+        than once, only its last entry is applied. Returns the number of
+        items that were actually updated.
+
+        Unlike update_item, a tx_hash with no row is simply skipped; callers
+        that care should filter with present_items() and do their own
+        should_defer_update_incr() accounting for the misses. '''
+        if not self.wallet: return 0
+        by_hash = {item[0]: item for item in items}
+        cur = self.currentItem()
+        get_item = self._item_cache.get
+        n_updates = 0
+        for tx_hash, height, conf, timestamp in by_hash.values():
+            item = get_item(tx_hash)
+            if item:
+                self._update_item_status(item, tx_hash, height, conf, timestamp, cur)
+                n_updates += 1
+        return n_updates
+
     def create_menu(self, position):
         item = self.currentItem()
         if not item:
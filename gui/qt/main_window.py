@@ -27,10 +27,11 @@ import sys, time, threading
 import os, json, traceback
 import shutil
 import csv
+import io
 from decimal import Decimal as PyDecimal  # Qt 5.12 also exports Decimal
 import base64
-from functools import partial
-from collections import OrderedDict
+from functools import partial, lru_cache
+from collections import OrderedDict, deque
 from typing import List
 
 from PyQt5.QtGui import *
@@ -46,7 +47,7 @@ from electroncash.i18n import _, ngettext
 from electroncash.util import (format_time, format_spocks, PrintError,
                                format_spocks_plain, NotEnoughFunds,
                                ExcessiveFee, UserCancelled, InvalidPassword,
-                               bh2u, bfh, format_fee_spocks, Weak,
+                               bfh, format_fee_spocks, Weak,
                                print_error)
 import electroncash.web as web
 from electroncash import Transaction
@@ -69,6 +70,38 @@ from .popup_widget import ShowPopupLabel, KillPopupLabel, PopupWidget
 from . import cashacctqt
 from .util import *
 
+_USER_DIR = os.path.expanduser('~')  # resolved once; used as the default directory for file dialogs
+_DEFAULT_HISTORY_CSV = os.path.join(_USER_DIR, 'electron-cash-history.csv')
+_MAX_TX_FILE_SIZE = 4 * 1024 * 1024  # read_tx_from_file refuses larger files; a hex encoded max-size tx is well under this
+
+# Used by ElectrumWindow.clean_up_children to decide which children to reparent
+_CLEANUP_TYPES = (QWidget, QAction, TaskThread)
+_CLEANUP_SKIP_TYPES = (QStatusBar, QMenuBar, QFocusFrame, QShortcut)
+
+@lru_cache(maxsize=16)
+def _fx_currencies(fx, history):
+    ''' Memoized (sorted) fx.get_currencies(). The exchange/currency table
+    behind it is static, yet building it is not free. '''
+    return tuple(fx.get_currencies(history))
+
+@lru_cache(maxsize=64)
+def _fx_exchanges_by_ccy(fx, ccy, history):
+    ''' Memoized, sorted fx.get_exchanges_by_ccy(). '''
+    return tuple(sorted(fx.get_exchanges_by_ccy(ccy, history)))
+
+def _cached_icon_pixmap(path, w, h):
+    ''' Returns QIcon(path).pixmap(w, h), going through the global
+    QPixmapCache so that the PNG/SVG resource is only decoded and rasterized
+    once per (resource, size, devicePixelRatio). '''
+    screen = QApplication.primaryScreen()
+    dpr = screen.devicePixelRatio() if screen else 1.0
+    key = f"{path}:{w}x{h}:{dpr}"
+    pm = QPixmapCache.find(key)
+    if pm is None or pm.isNull():
+        pm = QIcon(path).pixmap(w, h)
+        QPixmapCache.insert(key, pm)
+    return pm
+
 class StatusBarButton(QPushButton):
     def __init__(self, icon, tooltip, func):
         QPushButton.__init__(self, icon, '')
@@ -109,6 +142,7 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
     ca_address_default_changed_signal = pyqtSignal(object)  # passes cashacct.Info object to slot, which is the new default. Mainly emitted by address_list and address_dialog
 
     status_icon_dict = dict()  # app-globel cache of "status_*" -> QIcon instances (for update_status() speedup)
+    _cached_lang_items = None  # app-global cache of (language_keys, language_names) for settings_dialog, built on first use
 
     def __init__(self, gui_object, wallet):
         QMainWindow.__init__(self)
@@ -348,12 +382,14 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
         elif event == 'blockchain_updated':
             self.need_update.set()
         elif event == 'new_transaction':
-            self.tx_update_mgr.notif_add(args)  # added only if this wallet's tx
+            # args: [tx, wallet]
             if args[1] is self.wallet:
+                self.tx_update_mgr.notif_add(args[0])
                 self.network_signal.emit(event, args)
         elif event == 'verified2':
-            self.tx_update_mgr.verif_add(args)  # added only if this wallet's tx
+            # args: [wallet, tx_hash, height, conf, timestamp]
             if args[0] is self.wallet:
+                self.tx_update_mgr.verif_add(args[1:])
                 self.network_signal.emit(event, args)
         elif event in ['status', 'banner', 'fee']:
             # Handle in GUI thread
@@ -724,8 +760,7 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
     def static_getOpenFileName(*, title, parent=None, config=None, filter=""):
         if not config:
             config = get_config()
-        userdir = os.path.expanduser('~')
-        directory = config.get('io_dir', userdir) if config else userdir
+        directory = config.get('io_dir', _USER_DIR) if config else _USER_DIR
         fileName, __ = QFileDialog.getOpenFileName(parent, title, directory, filter)
         if fileName and directory != os.path.dirname(fileName) and config:
             config.set_key('io_dir', os.path.dirname(fileName), True)
@@ -735,8 +770,7 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
     def static_getSaveFileName(*, title, filename, parent=None, config=None, filter=""):
         if not config:
             config = get_config()
-        userdir = os.path.expanduser('~')
-        directory = config.get('io_dir', userdir) if config else userdir
+        directory = config.get('io_dir', _USER_DIR) if config else _USER_DIR
         path = os.path.join( directory, filename )
         fileName, __ = QFileDialog.getSaveFileName(parent, title, path, filter)
         if fileName and directory != os.path.dirname(fileName) and config:
@@ -3063,10 +3097,12 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
         parent = parent or self
         return PasswordDialog(parent, msg).run()
 
-    def tx_from_text(self, txt):
+    def tx_from_text(self, txt, *, is_hex=False):
+        ''' txt is json or raw hex. Pass is_hex=True if the caller already
+        knows txt is well formed raw hex, to skip re-checking that. '''
         from electroncash.transaction import tx_from_str
         try:
-            txt_tx = tx_from_str(txt)
+            txt_tx = txt if is_hex else tx_from_str(txt)
             tx = Transaction(txt_tx, sign_schnorr=self.wallet.is_schnorr_enabled())
             tx.deserialize()
             if self.wallet:
@@ -3120,8 +3156,9 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
                     return
                 # else if the user scanned an offline signed tx
                 try:
-                    result = bh2u(bitcoin.base_decode(result, length=None, base=43))
-                    tx = self.tx_from_text(result)  # will show an error dialog on error
+                    # base_decode gives us bytes, so .hex() is well formed hex
+                    raw_hex = bitcoin.base_decode(result, length=None, base=43).hex()
+                    tx = self.tx_from_text(raw_hex, is_hex=True)  # will show an error dialog on error
                     if not tx:
                         return
                 except BaseException as e:
@@ -3143,10 +3180,11 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
         if not fileName:
             return
         try:
+            if os.path.getsize(fileName) > _MAX_TX_FILE_SIZE:
+                raise ValueError(_("File is too large to be a transaction"))
             with open(fileName, "r", encoding='utf-8') as f:
-                file_content = f.read()
-            file_content = file_content.strip()
-            tx_file_dict = json.loads(str(file_content))
+                file_content = f.read().strip()
+            tx_file_dict = json.loads(file_content)
         except (ValueError, IOError, OSError, json.decoder.JSONDecodeError) as reason:
             self.show_critical(_("DeLight was unable to open your transaction file") + "\n" + str(reason), title=_("Unable to read file or no transaction found"))
             return
@@ -3222,29 +3260,41 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
         b.setEnabled(False)
         vbox.addLayout(Buttons(CancelButton(d), b))
 
-        private_keys = {}
+        private_keys = []  # list of (address_ui_string, privkey) in address order
         addresses = self.wallet.get_addresses()
         done = False
         cancelled = False
         def privkeys_thread():
-            for addr in addresses:
-                time.sleep(0.1)
+            # Key derivation is pure Python and holds the GIL, so extra
+            # threads would not help. Instead of sleeping 0.1s per key, work
+            # in ~20ms slices and sleep 10ms between them: that still leaves
+            # the GUI thread plenty of time to run, at a fraction of the cost.
+            # Progress updates are rate-limited to 10/sec so that big wallets
+            # don't flood the GUI event queue with redundant repaints.
+            slice_end = time.monotonic() + 0.02
+            next_emit_time, last = 0.0, len(addresses) - 1
+            for i, addr in enumerate(addresses):
                 if done or cancelled:
                     break
+                if time.monotonic() >= slice_end:
+                    time.sleep(0.01)
+                    slice_end = time.monotonic() + 0.02
                 try:
                     privkey = self.wallet.export_private_key(addr, password)
                 except InvalidPassword:
                     # See #921 -- possibly a corrupted wallet or other strangeness
                     privkey = 'INVALID_PASSWORD'
-                private_keys[addr.to_ui_string()] = privkey
-                self.computing_privkeys_signal.emit()
+                private_keys.append((addr.to_ui_string(), privkey))
+                now = time.monotonic()
+                if now >= next_emit_time or i == last:
+                    next_emit_time = now + 0.1
+                    self.computing_privkeys_signal.emit()
             if not cancelled:
                 self.computing_privkeys_signal.disconnect()
                 self.show_privkeys_signal.emit()
 
         def show_privkeys():
-            s = "\n".join('{}\t{}'.format(addr, privkey)
-                          for addr, privkey in private_keys.items())
+            s = "\n".join([f'{addr}\t{privkey}' for addr, privkey in private_keys])
             e.setText(s)
             b.setEnabled(True)
             self.show_privkeys_signal.disconnect()
@@ -3259,7 +3309,8 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
                 self.computing_privkeys_signal.disconnect()
                 self.show_privkeys_signal.disconnect()
 
-        self.computing_privkeys_signal.connect(lambda: e.setText(_("Please wait... {num}/{total}").format(num=len(private_keys),total=len(addresses))))
+        progress_fmt, num_addresses = _("Please wait... {num}/{total}"), len(addresses)
+        self.computing_privkeys_signal.connect(lambda: e.setText(progress_fmt.format(num=len(private_keys), total=num_addresses)))
         self.show_privkeys_signal.connect(show_privkeys)
         d.finished.connect(on_dialog_closed)
         threading.Thread(target=privkeys_thread).start()
@@ -3274,20 +3325,25 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
         if not filename:
             return
 
-        try:
-            self.do_export_privkeys(filename, private_keys, csv_button.isChecked())
-        except (IOError, os.error) as reason:
-            txt = "\n".join([
-                _("DeLight was unable to produce a private key-export."),
-                str(reason)
-            ])
-            self.show_critical(txt, title=_("Unable to create csv"))
-
-        except Exception as e:
-            self.show_message(str(e))
-            return
+        def on_success(result):
+            self.show_message(_("Private keys exported."))
+
+        def on_error(exc_info):
+            reason = exc_info[1]
+            if isinstance(reason, (IOError, os.error)):
+                txt = "\n".join([
+                    _("DeLight was unable to produce a private key-export."),
+                    str(reason)
+                ])
+                self.show_critical(txt, title=_("Unable to create csv"))
+            else:
+                self.show_message(str(reason))
 
-        self.show_message(_("Private keys exported."))
+        # File emission happens in a worker thread so the GUI doesn't freeze
+        # on wallets with many addresses.
+        WaitingDialog(self, _('Exporting private keys...'),
+                      partial(self.do_export_privkeys, filename, dict(private_keys), csv_button.isChecked()),
+                      on_success, on_error, disable_escape_key=True)
 
     def do_export_privkeys(self, fileName, pklist, is_csv):
         with open(fileName, "w+", encoding='utf-8') as f:
@@ -3297,7 +3353,7 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
                 for addr, pk in pklist.items():
                     transaction.writerow(["%34s"%addr,pk])
             else:
-                f.write(json.dumps(pklist, indent = 4))
+                json.dump(pklist, f, indent = 4)  # stream to the file, don't build one giant str first
 
     def do_import_labels(self):
         labelsFile = self.getOpenFileName(_("Open labels file"), "*.json")
@@ -3334,7 +3390,7 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
         d = WindowModalDialog(self.top_level_window(), _('Export History'))
         d.setMinimumSize(400, 200)
         vbox = QVBoxLayout(d)
-        defaultname = os.path.expanduser('~/electron-cash-history.csv')
+        defaultname = _DEFAULT_HISTORY_CSV
         select_msg = _('Select file to export your wallet transactions to')
         hbox, filename_e, csv_button = filename_field(self, self.config, defaultname, select_msg)
         vbox.addLayout(hbox)
@@ -3350,13 +3406,23 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
         filename = filename_e.text()
         if not filename:
             return
-        try:
-            self.do_export_history(self.wallet, filename, csv_button.isChecked())
-        except (IOError, os.error) as reason:
-            export_error_label = _("DeLight was unable to produce a transaction export.")
-            self.show_critical(export_error_label + "\n" + str(reason), title=_("Unable to export history"))
-            return
-        self.show_message(_("Your wallet history has been successfully exported."))
+
+        def on_success(result):
+            self.show_message(_("Your wallet history has been successfully exported."))
+
+        def on_error(exc_info):
+            reason = exc_info[1]
+            if isinstance(reason, (IOError, os.error)):
+                export_error_label = _("DeLight was unable to produce a transaction export.")
+                self.show_critical(export_error_label + "\n" + str(reason), title=_("Unable to export history"))
+            else:
+                self.on_error(exc_info)
+
+        # Large histories can take a while to serialize, so do it in a worker
+        # thread and keep the GUI responsive.
+        WaitingDialog(self, _('Exporting history...'),
+                      partial(self.do_export_history, self.wallet, filename, csv_button.isChecked()),
+                      on_success, on_error, disable_escape_key=True)
 
     def plot_history_dialog(self):
         if plot_history is None:
@@ -3371,33 +3437,45 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
         history = wallet.export_history(fx=self.fx)
         ccy = (self.fx and self.fx.get_currency()) or ''
         has_fiat_columns = history and self.fx and self.fx.show_history() and 'fiat_value' in history[0] and 'fiat_balance' in history[0]
-        lines = []
-        for item in history:
-            if is_csv:
-                cols = [item['txid'], item.get('label', ''), item['confirmations'], item['value'], item['date']]
-                if has_fiat_columns:
-                    cols += [item['fiat_value'], item['fiat_balance']]
-                lines.append(cols)
+
+        # Decide the shape of each row once, up front, so that the per-item
+        # work below is a single call with no branching.
+        if is_csv:
+            if has_fiat_columns:
+                def massage(item):
+                    return (item['txid'], item.get('label', ''), item['confirmations'], item['value'], item['date'],
+                            item['fiat_value'], item['fiat_balance'])
             else:
-                if has_fiat_columns and ccy:
+                def massage(item):
+                    return (item['txid'], item.get('label', ''), item['confirmations'], item['value'], item['date'])
+        elif has_fiat_columns:
+            if ccy:
+                def massage(item):
                     item['fiat_currency'] = ccy  # add the currency to each entry in the json. this wastes space but json is bloated anyway so this won't hurt too much, we hope
-                elif not has_fiat_columns:
-                    # No need to include these fields as they will always be 'No Data'
-                    item.pop('fiat_value', None)
-                    item.pop('fiat_balance', None)
-                lines.append(item)
-
-        with open(fileName, "w+", encoding="utf-8") as f:  # ensure encoding to utf-8. Avoid Windows cp1252. See #1453.
-            if is_csv:
-                transaction = csv.writer(f, lineterminator='\n')
+            else:
+                massage = None
+        else:
+            def massage(item):
+                # No need to include these fields as they will always be 'No Data'
+                item.pop('fiat_value', None)
+                item.pop('fiat_balance', None)
+
+        if is_csv:
+            # A large write buffer lets the rows go out in big chunks.
+            with io.TextIOWrapper(io.BufferedWriter(io.FileIO(fileName, 'w'), 1 << 20),
+                                  encoding='utf-8', newline='') as f:  # ensure encoding to utf-8. Avoid Windows cp1252. See #1453.
+                transaction = csv.writer(f, lineterminator=os.linesep)  # os.linesep: same line endings the old text-mode file produced
                 cols = ["transaction_hash","label", "confirmations", "value", "timestamp"]
                 if has_fiat_columns:
                     cols += [f"fiat_value_{ccy}", f"fiat_balance_{ccy}"]  # in CSV mode, we use column names eg fiat_value_USD, etc
                 transaction.writerow(cols)
-                for line in lines:
-                    transaction.writerow(line)
-            else:
-                f.write(json.dumps(lines, indent=4))
+                transaction.writerows(map(massage, history))
+        else:
+            if massage:
+                for item in history:
+                    massage(item)  # modifies item in-place, no need to build a second list
+            with open(fileName, "w+", encoding="utf-8") as f:  # ensure encoding to utf-8. Avoid Windows cp1252. See #1453.
+                f.write(json.dumps(history, indent=4))
 
     def sweep_key_dialog(self):
         addresses = self.wallet.get_unused_addresses()
@@ -3437,22 +3515,35 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
         def get_address_text():
             return addr_combo.currentText()
 
-        def get_priv_keys():
-            return keystore.get_private_keys(keys_e.toPlainText(), allow_bip38=True)
+        def get_priv_keys(text=None):
+            if text is None:
+                text = keys_e.toPlainText()
+            return keystore.get_private_keys(text, allow_bip38=True)
 
-        def has_bip38_keys_but_no_bip38():
+        def has_bip38_keys_but_no_bip38(keys):
             if bitcoin.is_bip38_available():
                 return False
-            keys = [k for k in keys_e.toPlainText().split() if k]
-            return any(bitcoin.is_bip38_key(k) for k in keys)
+            return any(map(bitcoin.is_bip38_key, keys))
 
         def enable_sweep():
-            bad_bip38 = has_bip38_keys_but_no_bip38()
-            sweepok = bool(get_address_text() and not bad_bip38 and get_priv_keys())
+            text = keys_e.toPlainText()
+            keys = text.split()  # split just once, and only parse the keys if there is anything to parse
+            bad_bip38 = has_bip38_keys_but_no_bip38(keys)
+            sweepok = bool(keys and get_address_text() and not bad_bip38 and get_priv_keys(text))
             sweep_button.setEnabled(sweepok)
             bip38_warn_label.setHidden(not bad_bip38)
 
-        keys_e.textChanged.connect(enable_sweep)
+        timer = QTimer(d)
+        timer.setSingleShot(True)
+        timer.timeout.connect(enable_sweep)
+
+        def on_edit():
+            sweep_button.setDisabled(True)  # Disable the Sweep button right away
+            # re-start the timer to fire in 150 ms. this way a big paste or
+            # fast typing leads to just 1 re-parse of the keys text
+            timer.start(150)
+
+        keys_e.textChanged.connect(on_edit)
         enable_sweep()
         res = d.exec_()
         d.setParent(None)
@@ -3462,10 +3553,7 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
         try:
             self.do_clear()
             keys = get_priv_keys()
-            bip38s = {}
-            for i, k in enumerate(keys):
-                if bitcoin.is_bip38_key(k):
-                    bip38s[k] = i
+            bip38s = {k: i for i, k in enumerate(keys) if bitcoin.is_bip38_key(k)}
             if bip38s:
                 # For all the BIP38s detected, prompt for password
                 from .bip38_importer import Bip38Importer
@@ -3707,26 +3795,42 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
         global_tx_widgets, per_wallet_tx_widgets = [], []
         id_widgets = []
 
+        # Snapshot all the config keys read while building the dialog under a
+        # single acquisition of the config lock. Note that the callbacks below
+        # still read self.config directly, as values may change while the
+        # dialog is up.
+        with self.config.lock:
+            cfg = {key: self.config.get(key, default) for key, default in (
+                ('language', ''), ('show_fee', False), ('alias', ''),
+                ('ssl_privkey', None), ('ssl_chain', None), ('video_device', None),
+                ('qt_gui_color_theme', 'default'), ('qt_enable_highdpi', True),
+                ('qt_disable_highdpi', None), ('confirmed_only', False),
+                ('enable_opreturn', None),
+            )}
+
         # language
         lang_help = _('Select which language is used in the GUI (after restart).')
         lang_label = HelpLabel(_('Language') + ':', lang_help)
         lang_combo = QComboBox()
         from electroncash.i18n import languages, get_system_language_match, match_language
 
-        language_names = []
-        language_keys = []
-        for (lang_code, lang_def) in languages.items():
-            language_keys.append(lang_code)
-            lang_name = []
-            lang_name.append(lang_def.name)
-            if lang_code == '':
-                # System entry in languages list (==''), gets system setting
-                sys_lang = get_system_language_match()
-                if sys_lang:
-                    lang_name.append(f' [{languages[sys_lang].name}]')
-            language_names.append(''.join(lang_name))
+        if ElectrumWindow._cached_lang_items is None:
+            language_names = []
+            language_keys = []
+            for (lang_code, lang_def) in languages.items():
+                language_keys.append(lang_code)
+                lang_name = []
+                lang_name.append(lang_def.name)
+                if lang_code == '':
+                    # System entry in languages list (==''), gets system setting
+                    sys_lang = get_system_language_match()
+                    if sys_lang:
+                        lang_name.append(f' [{languages[sys_lang].name}]')
+                language_names.append(''.join(lang_name))
+            ElectrumWindow._cached_lang_items = (tuple(language_keys), tuple(language_names))
+        language_keys, language_names = ElectrumWindow._cached_lang_items
         lang_combo.addItems(language_names)
-        conf_lang = self.config.get("language", '')
+        conf_lang = cfg['language']
         if conf_lang:
             # The below code allows us to rename languages in saved config and
             # have them still line up with languages in our languages dict.
@@ -3781,7 +3885,7 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
         fee_widgets.append((customfee_label, customfee_e))
 
         feebox_cb = QCheckBox(_('Edit fees manually'))
-        feebox_cb.setChecked(self.config.get('show_fee', False))
+        feebox_cb.setChecked(cfg['show_fee'])
         feebox_cb.setToolTip(_("Show fee edit box in send tab."))
         def on_feebox(x):
             self.config.set_key('show_fee', x == Qt.Checked)
@@ -3794,7 +3898,7 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
               + '\n'.join(['https://cryptoname.co/', 'http://xmr.link/']) + '\n\n'\
               + _('For more information, see http://openalias.org')
         alias_label = HelpLabel(_('OpenAlias') + ':', msg)
-        alias = self.config.get('alias','')
+        alias = cfg['alias']
         alias_e = QLineEdit(alias)
         def set_alias_color():
             if not self.config.get('alias'):
@@ -3821,7 +3925,7 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
             _('SSL certificate used to sign payment requests.'),
             _('Use setconfig to set ssl_chain and ssl_privkey.'),
         ])
-        if self.config.get('ssl_privkey') or self.config.get('ssl_chain'):
+        if cfg['ssl_privkey'] or cfg['ssl_chain']:
             try:
                 SSL_identity = paymentrequest.check_ssl_config(self.config)
                 SSL_error = None
@@ -3883,8 +3987,7 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
         qr_combo.addItem(_("Default"),"default")
         system_cameras = []
         try:
-            from PyQt5.QtMultimedia import QCameraInfo
-            system_cameras = QCameraInfo.availableCameras()
+            system_cameras = self.gui_object.get_cached_cameras()
             qr_label = HelpLabel(_('Video Device') + ':', _("For scanning Qr codes."))
         except ImportError as e:
             # Older Qt or missing libs -- disable GUI control and inform user why
@@ -3894,7 +3997,7 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
             qr_label.setToolTip(qr_combo.toolTip())
         for cam in system_cameras:
             qr_combo.addItem(cam.description(), cam.deviceName())
-        video_device = self.config.get("video_device")
+        video_device = cfg['video_device']
         video_device_index = 0
         if video_device:
             video_device_index = qr_combo.findData(video_device)
@@ -3906,7 +4009,7 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
         colortheme_combo = QComboBox()
         colortheme_combo.addItem(_('Light'), 'default')
         colortheme_combo.addItem(_('Dark'), 'dark')
-        theme_name = self.config.get('qt_gui_color_theme', 'default')
+        theme_name = cfg['qt_gui_color_theme']
         dark_theme_available = self.gui_object.is_dark_theme_available()
         if theme_name == 'dark' and not dark_theme_available:
             theme_name = 'default'
@@ -3938,8 +4041,8 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
                 hidpi_chk.setToolTip(_("Enable/disable this option if you experience graphical glitches (such as overly large status bar icons)"))
             else: # windows
                 hidpi_chk.setToolTip(_("Enable/disable this option if you experience graphical glitches (such as dialog box text being cut off"))
-            hidpi_chk.setChecked(bool(self.config.get('qt_enable_highdpi', True)))
-            if self.config.get('qt_disable_highdpi'):
+            hidpi_chk.setChecked(bool(cfg['qt_enable_highdpi']))
+            if cfg['qt_disable_highdpi']:
                 hidpi_chk.setToolTip(_('Automatic high DPI scaling was disabled from the command-line'))
                 hidpi_chk.setChecked(False)
                 hidpi_chk.setDisabled(True)
@@ -4009,119 +4112,114 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
             multiple_cb.stateChanged.connect(on_multiple)
         per_wallet_tx_widgets.append((multiple_cb, None))
 
-        def fmt_docs(key, klass):
-            lines = [ln.lstrip(" ") for ln in klass.__doc__.split("\n")]
-            return '\n'.join([key, "", " ".join(lines)])
-
         def on_unconf(x):
             self.config.set_key('confirmed_only', bool(x))
-        conf_only = self.config.get('confirmed_only', False)
+        conf_only = cfg['confirmed_only']
         unconf_cb = QCheckBox(_('Spend only confirmed coins'))
         unconf_cb.setToolTip(_('Spend only confirmed inputs.'))
         unconf_cb.setChecked(conf_only)
         unconf_cb.stateChanged.connect(on_unconf)
         global_tx_widgets.append((unconf_cb, None))
 
-        # Fiat Currency
-        hist_checkbox = QCheckBox()
-        fiat_address_checkbox = QCheckBox()
-        ccy_combo = QComboBox()
-        ex_combo = QComboBox()
-
-        enable_opreturn = bool(self.config.get('enable_opreturn'))
+        enable_opreturn = bool(cfg['enable_opreturn'])
         opret_cb = QCheckBox(_('Enable OP_RETURN output'))
         opret_cb.setToolTip(_('Enable posting messages with OP_RETURN.'))
         opret_cb.setChecked(enable_opreturn)
         opret_cb.stateChanged.connect(self.on_toggled_opreturn)
         global_tx_widgets.append((opret_cb,None))
 
-        def update_currencies():
-            if not self.fx: return
-            currencies = sorted(self.fx.get_currencies(self.fx.get_history_config()))
-            ccy_combo.clear()
-            ccy_combo.addItems([_('None')] + currencies)
-            if self.fx.is_enabled():
-                ccy_combo.setCurrentIndex(ccy_combo.findText(self.fx.get_currency()))
-
-        def update_history_cb():
-            if not self.fx: return
-            hist_checkbox.setChecked(self.fx.get_history_config())
-            hist_checkbox.setEnabled(self.fx.is_enabled())
-
-        def update_fiat_address_cb():
-            if not self.fx: return
-            fiat_address_checkbox.setChecked(self.fx.get_fiat_address_config())
-
-        def update_exchanges():
-            if not self.fx: return
-            b = self.fx.is_enabled()
-            ex_combo.setEnabled(b)
-            if b:
-                c = self.fx.get_currency()
-                h = self.fx.get_history_config()
-            else:
-                c, h = self.fx.default_currency, False
-            exchanges = self.fx.get_exchanges_by_ccy(c, h)
-            conf_exchange = self.fx.config_exchange()
-            ex_combo.clear()
-            ex_combo.addItems(sorted(exchanges))
-            idx = ex_combo.findText(conf_exchange)  # try and restore previous exchange if in new list
-            if idx < 0:
-                # hmm, previous exchange wasn't in new h= setting. Try default exchange.
-                idx = ex_combo.findText(self.fx.default_exchange)
-            idx = 0 if idx < 0 else idx # if still no success (idx < 0) -> default to the first exchange in combo
-            if exchanges: # don't set index if no exchanges, as any index is illegal. this shouldn't happen.
-                ex_combo.setCurrentIndex(idx)  # note this will emit a currentIndexChanged signal if it's changed
-
-
-        def on_currency(hh):
-            if not self.fx: return
-            b = bool(ccy_combo.currentIndex())
-            ccy = str(ccy_combo.currentText()) if b else None
-            self.fx.set_enabled(b)
-            if b and ccy != self.fx.ccy:
-                self.fx.set_currency(ccy)
-            update_history_cb()
-            update_exchanges()
-            self.update_fiat()
+        # Fiat Currency
+        fiat_widgets = []
+        if self.fx:
+            hist_checkbox = QCheckBox()
+            fiat_address_checkbox = QCheckBox()
+            ccy_combo = QComboBox()
+            ex_combo = QComboBox()
+
+            def update_currencies():
+                currencies = _fx_currencies(self.fx, self.fx.get_history_config())
+                ccy_combo.clear()
+                ccy_combo.addItem(_('None'))
+                ccy_combo.addItems(currencies)
+                if self.fx.is_enabled():
+                    ccy_combo.setCurrentIndex(ccy_combo.findText(self.fx.get_currency()))
 
-        def on_exchange(idx):
-            exchange = str(ex_combo.currentText())
-            if self.fx and self.fx.is_enabled() and exchange and exchange != self.fx.exchange.name():
-                self.fx.set_exchange(exchange)
+            def update_history_cb():
+                hist_checkbox.setChecked(self.fx.get_history_config())
+                hist_checkbox.setEnabled(self.fx.is_enabled())
 
-        def on_history(checked):
-            if not self.fx: return
-            changed = bool(self.fx.get_history_config()) != bool(checked)
-            self.fx.set_history_config(checked)
-            update_exchanges()
-            self.history_list.refresh_headers()
-            if self.fx.is_enabled() and checked:
-                # reset timeout to get historical rates
-                self.fx.timeout = 0
-                if changed:
-                    self.history_list.update()  # this won't happen too often as it's rate-limited
-
-        def on_fiat_address(checked):
-            if not self.fx: return
-            self.fx.set_fiat_address_config(checked)
-            self.address_list.refresh_headers()
-            self.address_list.update()
-
-        update_currencies()
-        update_history_cb()
-        update_fiat_address_cb()
-        update_exchanges()
-        ccy_combo.currentIndexChanged.connect(on_currency)
-        hist_checkbox.stateChanged.connect(on_history)
-        fiat_address_checkbox.stateChanged.connect(on_fiat_address)
-        ex_combo.currentIndexChanged.connect(on_exchange)
+            def update_fiat_address_cb():
+                fiat_address_checkbox.setChecked(self.fx.get_fiat_address_config())
 
-        fiat_widgets = []
-        fiat_widgets.append((QLabel(_('Fiat currency')), ccy_combo))
-        fiat_widgets.append((QLabel(_('Show history rates')), hist_checkbox))
-        fiat_widgets.append((QLabel(_('Show Fiat balance for addresses')), fiat_address_checkbox))
-        fiat_widgets.append((QLabel(_('Source')), ex_combo))
+            def update_exchanges():
+                b = self.fx.is_enabled()
+                ex_combo.setEnabled(b)
+                if b:
+                    c = self.fx.get_currency()
+                    h = self.fx.get_history_config()
+                else:
+                    c, h = self.fx.default_currency, False
+                exchanges = _fx_exchanges_by_ccy(self.fx, c, h)
+                conf_exchange = self.fx.config_exchange()
+                ex_combo.clear()
+                ex_combo.addItems(exchanges)
+                idx = ex_combo.findText(conf_exchange)  # try and restore previous exchange if in new list
+                if idx < 0:
+                    # hmm, previous exchange wasn't in new h= setting. Try default exchange.
+                    idx = ex_combo.findText(self.fx.default_exchange)
+                idx = 0 if idx < 0 else idx # if still no success (idx < 0) -> default to the first exchange in combo
+                if exchanges: # don't set index if no exchanges, as any index is illegal. this shouldn't happen.
+                    ex_combo.setCurrentIndex(idx)  # note this will emit a currentIndexChanged signal if it's changed
+
+
+            def on_currency(hh):
+                b = bool(ccy_combo.currentIndex())
+                ccy = str(ccy_combo.currentText()) if b else None
+                self.fx.set_enabled(b)
+                if b and ccy != self.fx.ccy:
+                    self.fx.set_currency(ccy)
+                update_history_cb()
+                update_exchanges()
+                self.update_fiat()
+
+            def on_exchange(idx):
+                exchange = str(ex_combo.currentText())
+                if self.fx and self.fx.is_enabled() and exchange and exchange != self.fx.exchange.name():
+                    self.fx.set_exchange(exchange)
+
+            def on_history(checked):
+                changed = bool(self.fx.get_history_config()) != bool(checked)
+                self.fx.set_history_config(checked)
+                update_exchanges()
+                self.history_list.refresh_headers()
+                if self.fx.is_enabled() and checked:
+                    # reset timeout to get historical rates
+                    self.fx.timeout = 0
+                    if changed:
+                        self.history_list.update()  # this won't happen too often as it's rate-limited
+
+            def on_fiat_address(checked):
+                self.fx.set_fiat_address_config(checked)
+                self.address_list.refresh_headers()
+                self.address_list.update()
+
+            update_currencies()
+            update_history_cb()
+            update_fiat_address_cb()
+            update_exchanges()
+            ccy_combo.currentIndexChanged.connect(on_currency)
+            hist_checkbox.stateChanged.connect(on_history)
+            fiat_address_checkbox.stateChanged.connect(on_fiat_address)
+            ex_combo.currentIndexChanged.connect(on_exchange)
+
+            fiat_widgets.append((QLabel(_('Fiat currency')), ccy_combo))
+            fiat_widgets.append((QLabel(_('Show history rates')), hist_checkbox))
+            fiat_widgets.append((QLabel(_('Show Fiat balance for addresses')), fiat_address_checkbox))
+            fiat_widgets.append((QLabel(_('Source')), ex_combo))
+        else:
+            # No point in building the widgets (and their update machinery) if
+            # fx is disabled entirely. Just show a placeholder.
+            fiat_widgets.append((QLabel(_('Fiat currency support is not available.')), None))
 
         tabs_info = [
             (gui_widgets, _('General')),
@@ -4134,8 +4232,7 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
             (id_widgets, _('Identity')),
         ]
         def add_tabs_info_to_tabs(tabs, tabs_info):
-            def add_widget_pair(a,b,grid):
-                i = grid.rowCount()
+            def add_widget_pair(a,b,grid,i):
                 if b:
                     if a:
                         grid.addWidget(a, i, 0)
@@ -4155,16 +4252,16 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
                         gbox = QGroupBox(groupName)
                         grid = QGridLayout(gbox)
                         grid.setColumnStretch(0,1)
-                        for a,b in widgets:
-                            add_widget_pair(a,b,grid)
+                        for i, (a,b) in enumerate(widgets):
+                            add_widget_pair(a,b,grid,i)
                         vbox.addWidget(gbox, len(widgets))
                 else:
                     # Standard layout.. 1 tab has just a grid of widgets
                     widgets = thing
                     grid = QGridLayout(tab)
                     grid.setColumnStretch(0,1)
-                    for a,b in widgets:
-                        add_widget_pair(a,b,grid)
+                    for i, (a,b) in enumerate(widgets):
+                        add_widget_pair(a,b,grid,i)
                 tabs.addTab(tab, name)
         # / add_tabs_info_to_tabs
         add_tabs_info_to_tabs(tabs, tabs_info)
@@ -4196,18 +4293,27 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
 
     def is_alive(self): return bool(not self.cleaned_up)
 
+    @classmethod
+    def _signal_names(cls):
+        ''' Returns the names of all the XXX_signal pyqtSignals on this class.
+        Computed once per class, the first time a window is cleaned up. '''
+        names = cls.__dict__.get('_signal_names_cache')
+        if names is None:
+            names = tuple(attr_name for attr_name in dir(cls)
+                          if attr_name.endswith("_signal") and attr_name != "cashaddr_toggled_signal"
+                          and isinstance(getattr(cls, attr_name, None), pyqtSignal))
+            cls._signal_names_cache = names
+        return names
+
     def clean_up_connections(self):
         def disconnect_signals():
-            for attr_name in dir(self):
-                if attr_name.endswith("_signal") and attr_name != "cashaddr_toggled_signal":
-                    sig = getattr(self, attr_name)
-                    if isinstance(sig, pyqtBoundSignal):
-                        try: sig.disconnect()
-                        except TypeError: pass # no connections
-                elif attr_name.endswith("__RateLimiter"): # <--- NB: this needs to match the attribute name in util.py rate_limited decorator
-                    rl_obj = getattr(self, attr_name)
-                    if isinstance(rl_obj, RateLimiter):
-                        rl_obj.kill_timer()
+            for attr_name in self._signal_names():
+                try: getattr(self, attr_name).disconnect()
+                except TypeError: pass # no connections
+            # RateLimiter state objects live in the instance dict, see util.py
+            for attr_name, rl_obj in list(vars(self).items()):
+                if attr_name.endswith("__RateLimiter") and isinstance(rl_obj, RateLimiter): # <--- NB: this needs to match the attribute name in util.py rate_limited decorator
+                    rl_obj.kill_timer()
             try: self.disconnect()
             except TypeError: pass
         def disconnect_network_callbacks():
@@ -4239,8 +4345,8 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
         # Reparent children to 'None' so python GC can clean them up sooner rather than later.
         # This also hopefully helps accelerate this window's GC.
         children = [c for c in self.children()
-                    if (isinstance(c, (QWidget, QAction, TaskThread))
-                        and not isinstance(c, (QStatusBar, QMenuBar, QFocusFrame, QShortcut)))]
+                    if (isinstance(c, _CLEANUP_TYPES)
+                        and not isinstance(c, _CLEANUP_SKIP_TYPES))]
         for c in children:
             try: c.disconnect()
             except TypeError: pass
@@ -4357,11 +4463,12 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
                 # All plugins get this whenever one is toggled.
                 run_hook('init_qt', gui_object)
 
-        for i, descr in enumerate(plugins.internal_plugin_metadata.values()):
-            name = descr['__name__']
-            p = plugins.get_internal_plugin(name)
+        metadata = list(plugins.internal_plugin_metadata.values())
+        for i, descr in enumerate(metadata):
             if descr.get('registers_keystore'):
                 continue
+            name = descr['__name__']
+            p = plugins.get_internal_plugin(name)
             try:
                 cb = QCheckBox(descr['fullname'])
                 weakCb = Weak.ref(cb)
@@ -4380,7 +4487,7 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
             except Exception:
                 self.print_msg("error: cannot display plugin", name)
                 traceback.print_exc(file=sys.stdout)
-        grid.setRowStretch(len(plugins.internal_plugin_metadata.values()), 1)
+        grid.setRowStretch(len(metadata), 1)
         vbox.addLayout(Buttons(CloseButton(d)))
         self.internalpluginsdialog = d
         d.exec_()
@@ -4430,16 +4537,22 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
         grid.addWidget(QLabel(_('Total size') + ':'), 0, 0)
         grid.addWidget(QLabel(_('{total_size} bytes').format(total_size=total_size)), 0, 1)
         max_fee = new_tx.output_value()
+        base_unit = self.base_unit()  # can't change while this modal dialog is up
         grid.addWidget(QLabel(_('Input amount') + ':'), 1, 0)
-        grid.addWidget(QLabel(self.format_amount(max_fee) + ' ' + self.base_unit()), 1, 1)
+        grid.addWidget(QLabel(self.format_amount(max_fee) + ' ' + base_unit), 1, 1)
         output_amount = QLabel('')
         grid.addWidget(QLabel(_('Output amount') + ':'), 2, 0)
         grid.addWidget(output_amount, 2, 1)
         fee_e = BTCAmountEdit(self.get_decimal_point)
-        def f(x):
+        def f():
             a = max_fee - fee_e.get_amount()
-            output_amount.setText((self.format_amount(a) + ' ' + self.base_unit()) if a else '')
-        fee_e.textChanged.connect(f)
+            output_amount.setText((self.format_amount(a) + ' ' + base_unit) if a else '')
+        # collapse bursts of keystrokes (and slider moves) into 1 update every 50ms
+        update_timer = QTimer(d)
+        update_timer.setSingleShot(True)
+        update_timer.setInterval(50)
+        update_timer.timeout.connect(f)
+        fee_e.textChanged.connect(lambda x: update_timer.start())
         fee = self.config.fee_per_kb() * total_size / 1000
         fee_e.setAmount(fee)
         grid.addWidget(QLabel(_('Fee' + ':')), 3, 0)
@@ -4601,18 +4714,25 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
         def on_link(ignored):
             webopen('https://devault.id/')
         name, placeholder = '', 'Satoshi_Nakamoto'
+        # Only the block height part of the prompt changes between retries,
+        # so build everything else just once.
+        msg_head = "".join([
+            _("You are registering a new <a href='ca'>DeVault ID</a> for your address <b><pre>{address}</pre></b>").format(address=addr.to_ui_string()),
+            "<br>",
+            _("How it works: <a href='ca'>DeVault IDs</a> registrations work by issuing an <b>OP_RETURN</b> transaction to yourself, costing fractions of a penny. "
+              "You will be offered the opportunity to review the generated transaction before broadcasting it to the blockchain."),
+            "<br><br>",
+        ])
+        msg_height_fmt = _("The current block height is <b><i>{block_height}</i></b>, so the new cash account will likely look like: <b><u><i>AccountName<i>#{number}</u></b>.")
+        msg_tail = "<br><br>" + _("Specify the <b>account name</b> below (limited to 99 characters):")
         while True:
             lh = self.wallet.get_local_height()
+            msg_height = msg_height_fmt.format(block_height=lh or '???', number=max(cashacct.bh2num(lh or 0)+1, 0) or '???')
             name = line_dialog(self, _("Register A New DeVault ID"),
-                               (_("You are registering a new <a href='ca'>DeVault ID</a> for your address <b><pre>{address}</pre></b>").format(address=addr.to_ui_string())
-                                + "<<br>" + _("How it works: <a href='ca'>DeVault IDs</a> registrations work by issuing an <b>OP_RETURN</b> transaction to yourself, costing fractions of a penny. "
-                                              "You will be offered the opportunity to review the generated transaction before broadcasting it to the blockchain.")
-                                + "<br><br>" + _("The current block height is <b><i>{block_height}</i></b>, so the new cash account will likely look like: <b><u><i>AccountName<i>#{number}</u></b>.")
-                                .format(block_height=lh or '???', number=max(cashacct.bh2num(lh or 0)+1, 0) or '???')
-                                + "<br><br>" + _("Specify the <b>account name</b> below (limited to 99 characters):") ),
+                               f"{msg_head}{msg_height}{msg_tail}",
                                _("Proceed to Send Tab"), default=name, linkActivated=on_link,
                                placeholder=placeholder, disallow_empty=True,
-                               icon=QIcon(":icons/cashacct-logo.png"))
+                               icon=QIcon(_cached_icon_pixmap(":icons/cashacct-logo.png", 50, 50)))
             if name is None:
                 # user cancel
                 return
@@ -4669,7 +4789,7 @@ class ElectrumWindow(QMainWindow, MessageBoxMixin, PrintError):
 
             res = self.msg_box(
                 # TODO: get SVG icon..
-                parent = self, icon=QIcon(":icons/cashacct-logo.png").pixmap(75, 75),
+                parent = self, icon=_cached_icon_pixmap(":icons/cashacct-logo.png", 75, 75),
                 title=_('Register A New DeVault ID'), rich_text=True,
                 text = msg1, informative_text = msg2, detail_text = msg3,
                 checkbox_text=_("Never show this again"), checkbox_ischecked=False
@@ -4688,12 +4808,10 @@ class TxUpdateMgr(QObject, PrintError):
     def __init__(self, main_window_parent):
         assert isinstance(main_window_parent, ElectrumWindow), "TxUpdateMgr must be constructed with an ElectrumWindow as its parent"
         super().__init__(main_window_parent)
-        self.lock = threading.Lock()  # used to lock thread-shared attrs below
-        # begin thread-shared attributes
-        self.notif_q = []
-        self.verif_q = []
-        self.need_process_v, self.need_process_n = False, False
-        # /end thread-shared attributes
+        # Thread-shared queues. deque.append and deque.popleft are atomic, so
+        # no lock is needed. A non-empty queue means the GUI needs updating.
+        self.notif_q = deque()
+        self.verif_q = deque()
         self.weakParent = Weak.ref(main_window_parent)
         main_window_parent.history_updated_signal.connect(self.verifs_get_and_clear, Qt.DirectConnection)  # immediately clear verif_q on history update because it would be redundant to keep the verify queue around after a history list update
         main_window_parent.on_timer_signal.connect(self.do_check, Qt.DirectConnection)  # hook into main_window's timer_actions function
@@ -4704,54 +4822,45 @@ class TxUpdateMgr(QObject, PrintError):
     def do_check(self):
         ''' Called from timer_actions in main_window to check if notifs or
         verifs need to update the GUI.
-          - Checks the need_process_[v|n] flags
-          - If either flag is set, call the @rate_limited process_verifs
+          - Checks whether verif_q and/or notif_q are non-empty
+          - If so, call the @rate_limited process_verifs
             and/or process_notifs functions which update GUI parent in a
             rate-limited (collated) fashion (for decent GUI responsiveness). '''
-        with self.lock:
-            bV, bN = self.need_process_v, self.need_process_n
-            self.need_process_v, self.need_process_n = False, False
-        if bV: self.process_verifs()  # rate_limited call (1 per second)
-        if bN: self.process_notifs()  # rate_limited call (1 per 15 seconds)
+        if self.verif_q: self.process_verifs()  # rate_limited call (1 per second)
+        if self.notif_q: self.process_notifs()  # rate_limited call (1 per 15 seconds)
+
+    @staticmethod
+    def _drain(q):
+        ''' Pops everything currently in deque q and returns it as a list.
+        Safe against concurrent appends (and other drainers) since each
+        popleft is atomic. '''
+        ret = []
+        try:
+            while True:
+                ret.append(q.popleft())
+        except IndexError:
+            pass
+        return ret
 
     def verifs_get_and_clear(self):
         ''' Clears the verif_q. This is called from the network
         thread for the 'verified2' event as well as from the below
-        update_verifs (GUI thread), hence the lock. '''
-        with self.lock:
-            ret = self.verif_q
-            self.verif_q = []
-            self.need_process_v = False
-            return ret
+        update_verifs (GUI thread). '''
+        return self._drain(self.verif_q)
 
     def notifs_get_and_clear(self):
-        with self.lock:
-            ret = self.notif_q
-            self.notif_q = []
-            self.need_process_n = False
-            return ret
+        return self._drain(self.notif_q)
 
-    def verif_add(self, args):
-        # args: [wallet, tx_hash, height, conf, timestamp]
-        # filter out tx's not for this wallet
-        parent = self.weakParent()
-        if not parent or parent.cleaned_up:
-            return
-        if args[0] is parent.wallet:
-            with self.lock:
-                self.verif_q.append(args[1:])
-                self.need_process_v = True
+    # The two methods below are called from the network thread, by
+    # ElectrumWindow.on_network, which has already filtered out tx's that
+    # are not for this window's wallet.
 
-    def notif_add(self, args):
-        parent = self.weakParent()
-        if not parent or parent.cleaned_up:
-            return
-        tx, wallet = args
-        # filter out tx's not for this wallet
-        if wallet is parent.wallet:
-            with self.lock:
-                self.notif_q.append(tx)
-                self.need_process_n = True
+    def verif_add(self, item):
+        # item: (tx_hash, height, conf, timestamp)
+        self.verif_q.append(item)
+
+    def notif_add(self, tx):
+        self.notif_q.append(tx)
 
     @rate_limited(1.0, ts_after=True)
     def process_verifs(self):
@@ -4761,22 +4870,31 @@ class TxUpdateMgr(QObject, PrintError):
         if not parent or parent.cleaned_up:
             return
         items = self.verifs_get_and_clear()
-        if items:
+        if not items:
+            return
+        hl = parent.history_list
+        n_items = len(items)
+        present = hl.present_items(items)
+        if len(present) < n_items:
+            # Some tx's have no row (yet). As update_item would, mark the
+            # list for a full refresh when next shown, if it is hidden.
+            hl.should_defer_update_incr()
+        # Only toggle updates/sorting (which invalidates the whole view) if
+        # at least one of the items is actually in the list.
+        if present:
             t0 = time.time()
-            parent.history_list.setUpdatesEnabled(False)
-            had_sorting = parent.history_list.isSortingEnabled()
+            hl.setUpdatesEnabled(False)
+            had_sorting = hl.isSortingEnabled()
             if had_sorting:
-                parent.history_list.setSortingEnabled(False)
-            n_updates = 0
-            for item in items:
-                did_update = parent.history_list.update_item(*item)
-                n_updates += 1 if did_update else 0
+                hl.setSortingEnabled(False)
+            n_updates = hl.update_items(present)
             self.print_error("Updated {}/{} verified txs in GUI in {:0.2f} ms"
-                             .format(n_updates, len(items), (time.time()-t0)*1e3))
+                             .format(n_updates, n_items, (time.time()-t0)*1e3))
             if had_sorting:
-                parent.history_list.setSortingEnabled(True)
-            parent.history_list.setUpdatesEnabled(True)
-            parent.update_status()
+                hl.setSortingEnabled(True)
+            hl.setUpdatesEnabled(True)
+        # Balances change on verification, so always refresh the status bar
+        parent.update_status()
 
     @rate_limited(5.0, classlevel=True)
     def process_notifs(self):
@@ -4790,12 +4908,18 @@ class TxUpdateMgr(QObject, PrintError):
                 n_ok, n_cashacct, total_amount = 0, 0, 0
                 last_seen_ca_name = ''
                 ca_txs = dict()  # 'txid' -> ('name', address)  -- will be given to contacts_list for "unconfirmed registrations" display
+                # local bindings for the loop below, which may run over hundreds of txs
+                get_wallet_delta = parent.wallet.get_wallet_delta
+                wallet_is_mine = parent.wallet.is_mine
+                ScriptOutput = cashacct.ScriptOutput
                 for tx in txns:
                     if tx:
-                        is_relevant, is_mine, v, fee = parent.wallet.get_wallet_delta(tx)
-                        for _typ, addr, val in tx.outputs():
-                            # Find DeVault ID registrations that are for addresses *in* this wallet
-                            if isinstance(addr, cashacct.ScriptOutput) and parent.wallet.is_mine(addr.address):
+                        is_relevant, is_mine, v, fee = get_wallet_delta(tx)
+                        # Find DeVault ID registrations that are for addresses *in* this wallet
+                        ca_addrs = [addr for _typ, addr, _val in tx.outputs()
+                                    if isinstance(addr, ScriptOutput)]
+                        for addr in ca_addrs:
+                            if wallet_is_mine(addr.address):
                                 n_cashacct += 1
                                 last_seen_ca_name = addr.name
                                 txid = tx.txid_fast()
@@ -20,6 +20,9 @@ class QRCodeWidget(QWidget, util.PrintError):
         QWidget.__init__(self)
         self.data = None
         self.qr = None
+        self._matrix = None  # cached self.qr.get_matrix(), computed in setData
+        self._qr_pixmap = None  # k x k pixmap (1 pixel per module) of the current QR matrix, computed in setData
+        self._cached_pixmap = None  # (size_key, QPixmap) rendering of the widget for the current data
         self.fixedSize = fixedSize
         self.setSizePolicy(QSizePolicy.MinimumExpanding, QSizePolicy.MinimumExpanding)
         if fixedSize:
@@ -31,12 +34,20 @@ class QRCodeWidget(QWidget, util.PrintError):
     def setData(self, data):
         if self.data != data:
             self.data = data
+        self._matrix, self._qr_pixmap, self._cached_pixmap = None, None, None
         if self.data:
             try:
                 self.qr = qrcode.QRCode()
                 self.qr.add_data(self.data)
+                # The matrix only depends on the data, so compute it (and a
+                # 1 pixel per module image of it) once here rather than on
+                # every repaint.
+                self._matrix = matrix = self.qr.get_matrix()
+                k = len(matrix)
+                buf = b''.join(map(bytes, matrix)).translate(self._gray_table)
+                img = QImage(buf, k, k, k, QImage.Format_Grayscale8)
+                self._qr_pixmap = QPixmap.fromImage(img)  # copies buf
                 if not self.fixedSize:
-                    k = len(self.qr.get_matrix())
                     self.setMinimumSize(k*5,k*5)
                     self.updateGeometry()
             except qrcode.exceptions.DataOverflowError:
@@ -56,51 +67,74 @@ class QRCodeWidget(QWidget, util.PrintError):
     def _bad_data(self, data):
         self.print_error("Failed to generate QR image -- data too long! Data length was: {} bytes".format(len(data or '')))
         self.qr = None
+        self._matrix, self._qr_pixmap, self._cached_pixmap = None, None, None
 
-    _black = QColor(0, 0, 0, 255)
-    _white = QColor(255, 255, 255, 255)
+    # maps a module value of the QR matrix (0/1) to a Grayscale8 pixel value
+    _gray_table = bytes([255, 0]) + bytes(254)
+    _white = Qt.white
 
     def paintEvent(self, e):
-        matrix = None
-
-        if self.data and self.qr:
-            try:
-                matrix = self.qr.get_matrix()
-            except qrcode.exceptions.DataOverflowError:
-                self._bad_data(self.data)  # sets self.qr = None
+        matrix = self._matrix if self.data and self.qr else None
 
         if not matrix:
             self._paint_blank()
             return
 
-        k = len(matrix)
+        size, dpr = self.size(), self.devicePixelRatioF()
+        key = (size.width(), size.height(), dpr)
+        cached = self._cached_pixmap
+        if cached and cached[0] == key:
+            # Repaint at the same size (the common case), just blit.
+            pm = cached[1]
+        else:
+            pm = self._render_pixmap(size, dpr, len(matrix))
+            self._cached_pixmap = (key, pm)
+
         qp = QtGui.QPainter(self)
-        r = qp.viewport()
+        qp.drawPixmap(0, 0, pm)
+        qp.end(); del qp
+
+    def get_pixmap(self):
+        ''' Returns what the widget currently shows as a QPixmap. Reuses the
+        pixmap cached by paintEvent if it is still valid for the current
+        size, otherwise falls back to grab(). '''
+        cached = self._cached_pixmap
+        if cached and self._matrix:
+            size = self.size()
+            if cached[0] == (size.width(), size.height(), self.devicePixelRatioF()):
+                return cached[1]
+        return self.grab()
+
+    def _render_pixmap(self, wsize, dpr, k):
+        pm = QPixmap(wsize * dpr)
+        pm.setDevicePixelRatio(dpr)  # stay crisp on high DPI screens
+        pm.fill(Qt.transparent)
+        qp = QtGui.QPainter(pm)
+        width, height = wsize.width(), wsize.height()
 
         margin = 5
-        framesize = min(r.width(), r.height())
+        framesize = min(width, height)
         boxsize = int( (framesize - 2*margin)/k )
         size = int(k*boxsize)
-        left = int((r.width() - size)/2)
-        top = int((r.height() - size)/2)
+        left = int((width - size)/2)
+        top = int((height - size)/2)
 
         # Make a white margin around the QR in case of dark theme use
         qp.setBrush(self._white)
         qp.setPen(self._white)
         qp.drawRect(int(left-margin), int(top-margin), size+(int(margin*2)), size+(int(margin*2)))
-        qp.setBrush(self._black)
-        qp.setPen(self._black)
 
-        for r in range(k):
-            for c in range(k):
-                if matrix[r][c]:
-                    qp.drawRect(left+c*boxsize, top+r*boxsize, boxsize - 1, boxsize - 1)
+        # Blit the k x k QR image scaled up by an integer factor. No smoothing,
+        # so that every module comes out as a crisp boxsize x boxsize square.
+        qp.setRenderHint(QtGui.QPainter.SmoothPixmapTransform, False)
+        qp.drawPixmap(QRect(left, top, size, size), self._qr_pixmap)
         qp.end(); del qp
+        return pm
 
 
 def save_to_file(qrw, parent):
     from .main_window import ElectrumWindow
-    p = qrw and qrw.grab()
+    p = qrw and qrw.get_pixmap()
     if p and not p.isNull():
         filename = ElectrumWindow.static_getSaveFileName(title=_("Save QR Image"), filename="qrcode.png", parent=parent, filter="*.png")
         if filename:
@@ -108,7 +142,7 @@ def save_to_file(qrw, parent):
             isinstance(parent, MessageBoxMixin) and parent.show_message(_("QR code saved to file") + " " + filename)
 
 def copy_to_clipboard(qrw, widget):
-    p = qrw and qrw.grab()
+    p = qrw and qrw.get_pixmap()
     if p and not p.isNull():
         QApplication.clipboard().setPixmap(p)
         QToolTip.showText(QCursor.pos(), _("QR code copied to clipboard"), widget)